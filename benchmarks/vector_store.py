@@ -0,0 +1,118 @@
+"""Benchmark NumpyVectorStore against Chroma.
+
+Embeddings are precomputed with a fake embedding model, so only the overhead of
+the vector stores is measured. Each store runs in its own process, and memory is reported
+as the peak RSS of that process, which includes native allocations (e.g. sqlite, hnswlib).
+
+Usage:
+    $ python benchmarks/vector_store.py --num-chunks 300 --num-queries 100
+"""
+
+import argparse
+import resource
+import subprocess
+import sys
+import time
+import uuid
+
+from langchain_chroma import Chroma
+from langchain_core.embeddings import DeterministicFakeEmbedding, Embeddings
+
+from blog_writer.tools.embedder import NumpyVectorStore
+
+
+class PrecomputedEmbeddings(Embeddings):
+    """Embeddings looked up from a precomputed table."""
+
+    def __init__(self, table: dict[str, list[float]]):
+        """Create embeddings from a table of text to embedding."""
+        self.table = table
+
+    def embed_documents(self, texts: list[str]) -> list[list[float]]:
+        """Look up embeddings of the texts."""
+        return [self.table[text] for text in texts]
+
+    def embed_query(self, text: str) -> list[float]:
+        """Look up the embedding of the query."""
+        return self.table[text]
+
+
+def get_max_rss() -> float:
+    """Get the peak resident set size of the current process in MiB."""
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return max_rss / 2**20 if sys.platform == "darwin" else max_rss / 2**10
+
+
+def benchmark(store: str, num_chunks: int, num_queries: int, dim: int) -> None:
+    """Measure build time, query latency and memory of a vector store.
+
+    This is meant to run in a fresh process per store, so that the peak RSS of one store
+    does not hide the memory of the other. Both stores are imported in every process,
+    so the RSS before building is the same baseline for both.
+
+    Args:
+        store (str): The vector store to measure, "numpy" or "chroma".
+        num_chunks (int): The number of chunks to index.
+        num_queries (int): The number of queries to run.
+        dim (int): The dimension of the embeddings.
+    """
+    fake_embedding = DeterministicFakeEmbedding(size=dim)
+    texts = [f"chunk {i}" for i in range(num_chunks)]
+    embeddings = PrecomputedEmbeddings(dict(zip(texts, fake_embedding.embed_documents(texts))))
+    queries = [fake_embedding.embed_query(f"query {i}") for i in range(num_queries)]
+
+    baseline_rss = get_max_rss()
+    start = time.perf_counter()
+    if store == "numpy":
+        vector_store = NumpyVectorStore.from_texts(texts, embeddings)
+    else:
+        vector_store = Chroma.from_texts(texts, embeddings, collection_name=uuid.uuid4().hex)
+    build_time = time.perf_counter() - start
+    build_rss = get_max_rss()
+
+    start = time.perf_counter()
+    for query in queries:
+        vector_store.similarity_search_by_vector(query, k=4)
+    search_time = (time.perf_counter() - start) / num_queries
+
+    start = time.perf_counter()
+    for query in queries:
+        vector_store.max_marginal_relevance_search_by_vector(query, k=4, fetch_k=20)
+    mmr_time = (time.perf_counter() - start) / num_queries
+
+    print(
+        f"{store:<8} build {build_time * 1e3:8.2f} ms | "
+        f"top-k {search_time * 1e3:7.3f} ms | mmr {mmr_time * 1e3:7.3f} ms | "
+        f"peak rss {get_max_rss():8.2f} MiB (build +{build_rss - baseline_rss:7.2f} MiB)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--num-chunks", type=int, default=300)
+    parser.add_argument("--num-queries", type=int, default=100)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--store", choices=["numpy", "chroma"], default=None)
+    args = parser.parse_args()
+
+    if args.store is not None:
+        benchmark(args.store, args.num_chunks, args.num_queries, args.dim)
+    else:
+        # Measure each store in its own process, as peak RSS is a process-wide high-water mark
+        for store in ["numpy", "chroma"]:
+            subprocess.run(
+                [
+                    sys.executable,
+                    __file__,
+                    "--store",
+                    store,
+                    "--num-chunks",
+                    str(args.num_chunks),
+                    "--num-queries",
+                    str(args.num_queries),
+                    "--dim",
+                    str(args.dim),
+                ],
+                check=True,
+            )
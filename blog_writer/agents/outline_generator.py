@@ -8,15 +8,19 @@ from typing import Literal
 from langchain_core.documents import Document
 from langchain_core.output_parsers import JsonOutputParser
 from langchain_core.prompts import PromptTemplate
-from langchain_openai import ChatOpenAI
 from pydantic import Field, create_model
 
-from blog_writer.utils import State
+from blog_writer.utils import State, get_llm
 
 
 def create_outline_generator(state: State) -> dict:
     """Generate an outline for a blog post based on the reference contents.
 
+    If `previous_state` found reference contents for the same topic on the same platform,
+    they are reused instead of searching again, and its outline is reused as well
+    if the number of sections has not changed. If the previous search found nothing,
+    the search and outline are run again.
+
     Args:
         state (State): The state of the agent.
 
@@ -30,6 +34,20 @@ def create_outline_generator(state: State) -> dict:
             "reference_contents": state.get("reference_contents", []),
         }
 
+    # Reuse the search results and outline of the previous run if they are still valid
+    previous_state = state.get("previous_state") or {}
+    reference_contents = None
+    if (
+        previous_state
+        and not previous_state.get("custom_sections", False)
+        and previous_state.get("topic") == state["topic"]
+        and previous_state.get("platform") == state["platform"]
+        and previous_state.get("reference_contents")
+    ):
+        reference_contents = previous_state["reference_contents"]
+        if previous_state.get("total_sections") == state["total_sections"]:
+            return {"outline": previous_state["outline"], "reference_contents": reference_contents}
+
     def create_outline_model(section_count: int):
         fields = {
             f"section{i}": (str, Field(description=f"Title for section {i}"))
@@ -38,7 +56,7 @@ def create_outline_generator(state: State) -> dict:
         return create_model("DynamicOutline", **fields)
 
     # Generate outline using LLM
-    llm = ChatOpenAI(model="gpt-4o-mini")
+    llm = get_llm("outline_generator", "outline", state.get("model_routes"))
     dynamic_outline = create_outline_model(state["total_sections"])
     outline_parser = JsonOutputParser(pydantic_object=dynamic_outline)
 
@@ -64,12 +82,15 @@ def create_outline_generator(state: State) -> dict:
         partial_variables={"format_instructions": outline_parser.get_format_instructions()},
     )
 
-    if state["platform"] == "naver":
-        secret_key = {
-            "client_id": state["naver_client_id"],
-            "client_secret": state["naver_client_secret"],
-        }
-    reference_contents = scrape_reference_contents(state["topic"], state["platform"], secret_key)
+    if reference_contents is None:
+        if state["platform"] == "naver":
+            secret_key = {
+                "client_id": state["naver_client_id"],
+                "client_secret": state["naver_client_secret"],
+            }
+        reference_contents = scrape_reference_contents(
+            state["topic"], state["platform"], secret_key
+        )
 
     chain = outline_prompt | llm | outline_parser
     outline = chain.invoke(
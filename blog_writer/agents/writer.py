@@ -4,10 +4,9 @@ import base64
 
 from langchain.prompts import PromptTemplate
 from langchain_core.messages import HumanMessage
-from langchain_openai import ChatOpenAI
 from streamlit.runtime.uploaded_file_manager import UploadedFile
 
-from blog_writer.utils import State
+from blog_writer.utils import State, get_content, get_fingerprint, get_llm, get_model_config
 
 
 def get_image_as_base64(file: UploadedFile) -> str | None:
@@ -34,16 +33,40 @@ def create_writer(state: State) -> dict:
     This agent writes blog posts based on given outline.
     This agent can use reference contents to write blog posts as a tool.
 
+    If `previous_state` is given, each piece (greeting, sections, conclusion) and image caption
+    is regenerated only when the fingerprint of its dependencies has changed.
+    Earlier sections are passed to a section only as a hint against repetition, so they are not
+    tracked as its dependencies and editing one section does not regenerate the following ones.
+
     Args:
         state (State): The state of the blog post.
 
     Returns:
-        dict: The contents of the blog post.
+        dict: The contents of the blog post with the fingerprints of each piece
+            and the captions of each image.
     """
     reference_contents = "\n\n".join(
         [ref_content.page_content for ref_content in state["reference_contents"]]
     )
-    llm = ChatOpenAI(model="gpt-4o-mini")
+    model_routes = state.get("model_routes")
+    greeting_llm = get_llm("writer", "greeting", model_routes)
+    caption_llm = get_llm("writer", "caption", model_routes)
+    section_llm = get_llm("writer", "section", model_routes)
+    conclusion_llm = get_llm("writer", "conclusion", model_routes)
+
+    # Pieces of the previous run, keyed in the same order as its contents
+    previous_state = state.get("previous_state") or {}
+    previous_fingerprints = previous_state.get("fingerprints", {})
+    previous_pieces = dict(zip(previous_fingerprints, previous_state.get("contents", [])))
+    previous_captions = previous_state.get("image_captions", {})
+    fingerprints = {}
+    image_captions = {}
+
+    def get_previous_piece(key: str) -> str | None:
+        """Return the previous content of a piece if none of its dependencies changed."""
+        if key in previous_pieces and previous_fingerprints[key] == fingerprints[key]:
+            return previous_pieces[key]
+        return None
 
     # Write greeting and introduction
     greeting_prompt = PromptTemplate.from_template(
@@ -51,17 +74,28 @@ def create_writer(state: State) -> dict:
         Please write a friendly and welcoming greeting to start a blog post about {topic}.
         Write like a friend who is visiting {topic} recently.
         Write in a comfortable and natural tone, but maintain a professional style.
+        Write the greeting concisely in 2~3 sentences.
         Writing style reference: {reference_style}
         Language: {language}
         """
     )
-    greeting = llm.invoke(
-        greeting_prompt.format(
-            topic=state["topic"],
-            reference_style=state["reference_style"],
-            language=state["language"],
+    fingerprints["greeting"] = get_fingerprint(
+        state["topic"],
+        state["reference_style"],
+        state["language"],
+        get_model_config("writer", "greeting", model_routes),
+    )
+    greeting = get_previous_piece("greeting")
+    if greeting is None:
+        greeting = get_content(
+            greeting_llm.invoke(
+                greeting_prompt.format(
+                    topic=state["topic"],
+                    reference_style=state["reference_style"],
+                    language=state["language"],
+                )
+            )
         )
-    ).content
     previous_contents = [greeting]
 
     # Write sections
@@ -97,43 +131,66 @@ def create_writer(state: State) -> dict:
         ],
     )
 
+    caption_prompt = "Please describe this image concisely in one sentence."
+    caption_config = get_model_config("writer", "caption", model_routes)
+    section_config = get_model_config("writer", "section", model_routes)
     for section_key, section in state["outline"].items():
         # 해당 섹션의 이미지 정보 가져오기
         section_images = state["section_images"].get(section_key, [])
         section_images_context = ""
         for section_image in section_images:
-            if image_base64 := get_image_as_base64(section_image):
-                image_context = llm.invoke(
-                    [
-                        HumanMessage(
-                            content=[
-                                {
-                                    "type": "text",
-                                    "text": "Please describe this image concisely in one sentence.",
-                                },
-                                {
-                                    "type": "image_url",
-                                    "image_url": {
-                                        "url": f"data:image/jpeg;base64,{image_base64}",
+            if section_image is None:
+                continue
+            # Captions are cached by image content, so moving a photo does not re-caption it
+            caption_key = get_fingerprint(section_image.getvalue(), caption_config)
+            image_context = previous_captions.get(caption_key)
+            if image_context is None:
+                image_base64 = get_image_as_base64(section_image)
+                image_context = get_content(
+                    caption_llm.invoke(
+                        [
+                            HumanMessage(
+                                content=[
+                                    {
+                                        "type": "text",
+                                        "text": caption_prompt,
                                     },
-                                },
-                            ]
-                        )
-                    ]
-                ).content
-                section_images_context += f"- {image_context}\n"
-
-        section_content = llm.invoke(
-            section_prompt.format(
-                topic=state["topic"],
-                section=section,
-                reference_contents=reference_contents,
-                previous_contents=previous_contents,
-                image_context=section_images_context,
-                reference_style=state["reference_style"],
-                language=state["language"],
-            )
-        ).content
+                                    {
+                                        "type": "image_url",
+                                        "image_url": {
+                                            "url": f"data:image/jpeg;base64,{image_base64}",
+                                        },
+                                    },
+                                ]
+                            )
+                        ]
+                    )
+                )
+            image_captions[caption_key] = image_context
+            section_images_context += f"- {image_context}\n"
+
+        fingerprints[section_key] = get_fingerprint(
+            state["topic"],
+            section,
+            reference_contents,
+            section_images_context,
+            state["reference_style"],
+            state["language"],
+            section_config,
+        )
+        section_content = get_previous_piece(section_key)
+        if section_content is None:
+            section_content = section_llm.invoke(
+                section_prompt.format(
+                    topic=state["topic"],
+                    section=section,
+                    reference_contents=reference_contents,
+                    previous_contents=previous_contents,
+                    image_context=section_images_context,
+                    reference_style=state["reference_style"],
+                    language=state["language"],
+                )
+            ).content
         previous_contents.append(section_content)
 
     # Write conclusion
@@ -153,14 +210,27 @@ def create_writer(state: State) -> dict:
         content
         """
     )
-    conclusion = llm.invoke(
-        conclusion_prompt.format(
-            topic=state["topic"],
-            reference_style=state["reference_style"],
-            previous_contents=previous_contents,
-            language=state["language"],
-        )
-    ).content
+    fingerprints["conclusion"] = get_fingerprint(
+        state["topic"],
+        state["reference_style"],
+        previous_contents,
+        state["language"],
+        get_model_config("writer", "conclusion", model_routes),
+    )
+    conclusion = get_previous_piece("conclusion")
+    if conclusion is None:
+        conclusion = conclusion_llm.invoke(
+            conclusion_prompt.format(
+                topic=state["topic"],
+                reference_style=state["reference_style"],
+                previous_contents=previous_contents,
+                language=state["language"],
+            )
+        ).content
     previous_contents.append(conclusion)
 
-    return {"contents": previous_contents}
+    return {
+        "contents": previous_contents,
+        "fingerprints": fingerprints,
+        "image_captions": image_captions,
+    }
@@ -1,20 +1,48 @@
 """Streamlit app for blog writer."""
 
 import os
+import shutil
+import tempfile
+import time
+import zipfile
 
 import streamlit as st
 from dotenv import load_dotenv
-from streamlit.runtime.uploaded_file_manager import UploadedFile
 
 from blog_writer.graph import create_graph
-from blog_writer.utils import State
+from blog_writer.tools.exporter import export_post
+from blog_writer.utils import RouteUsageTracker, State
 
+EXPORT_DIR = "exports"
+# Bundles of closed sessions are never replaced, so remove them once they are this old
+BUNDLE_MAX_AGE = 24 * 60 * 60
 
-def display_images(section_images: list[UploadedFile]) -> None:
+
+def remove_stale_bundles(export_dir: str = EXPORT_DIR, max_age: float = BUNDLE_MAX_AGE) -> None:
+    """Remove exported bundles older than `max_age`.
+
+    Args:
+        export_dir (str): The directory containing the bundle directories.
+        max_age (float): The maximum age of a bundle in seconds.
+    """
+    if not os.path.isdir(export_dir):
+        return
+
+    now = time.time()
+    for entry in os.scandir(export_dir):
+        try:
+            if entry.is_dir() and now - entry.stat().st_mtime > max_age:
+                shutil.rmtree(entry.path, ignore_errors=True)
+        except FileNotFoundError:
+            # Removed by another session in the meantime
+            continue
+
+
+def display_images(section_images: list[bytes]) -> None:
     """Display images in a grid.
 
     Args:
-        section_images: List of images to display.
+        section_images: List of the resized images to display.
     """
     if not section_images:
         return
@@ -52,8 +80,13 @@ def get_ui_text(language: str) -> dict:
             "photo_upload": "Photo Upload",
             "platform": "Platform",
             "language": "Language",
+            "incremental_check": "Only regenerate the changed parts of the previous post",
             "generate_button": "Generate Blog Post",
             "generating_spinner": "Generating blog post...",
+            "exporting_spinner": "Exporting blog post...",
+            "download_button": "Download Post Bundle",
+            "export_error": "Failed to export the blog post: {}",
+            "usage_expander": "LLM latency and cost by route",
         }
     return {
         "title": "✍️ 자동 블로그 글 생성기",
@@ -70,8 +103,13 @@ def get_ui_text(language: str) -> dict:
         "photo_upload": "사진 업로드",
         "platform": "플랫폼",
         "language": "언어",
+        "incremental_check": "이전 글에서 변경된 부분만 다시 생성",
         "generate_button": "블로그 글 생성",
         "generating_spinner": "블로그 글을 생성하고 있습니다...",
+        "exporting_spinner": "블로그 글을 내보내고 있습니다...",
+        "download_button": "블로그 글 다운로드",
+        "export_error": "블로그 글을 내보내지 못했습니다: {}",
+        "usage_expander": "경로별 LLM 지연 시간 및 비용",
     }
 
 
@@ -91,6 +129,18 @@ if __name__ == "__main__":
         st.session_state.custom_sections = False
     if "section_titles" not in st.session_state:
         st.session_state.section_titles = {}
+    if "last_state" not in st.session_state:
+        st.session_state.last_state = {}
+    if "topic" not in st.session_state:
+        st.session_state.topic = ""
+    if "llm_usage" not in st.session_state:
+        st.session_state.llm_usage = {}
+    if "post_images" not in st.session_state:
+        st.session_state.post_images = {}
+    if "bundle_dir" not in st.session_state:
+        st.session_state.bundle_dir = None
+    if "bundle_zip" not in st.session_state:
+        st.session_state.bundle_zip = None
 
     # Create form for input
     topic = st.text_input(ui_text["topic"], placeholder=ui_text["topic_placeholder"])
@@ -132,6 +182,9 @@ if __name__ == "__main__":
         st.session_state.section_images = section_images
 
     platform = st.selectbox(ui_text["platform"], ["naver"])
+    incremental = bool(st.session_state.last_state) and st.checkbox(
+        ui_text["incremental_check"], value=True
+    )
     submit_button = st.button(ui_text["generate_button"])
 
     if submit_button:
@@ -157,21 +210,89 @@ if __name__ == "__main__":
             ),
             section_images=st.session_state.get("section_images", {}),
             custom_sections=custom_sections and all(st.session_state.section_titles.values()),
+            previous_state=st.session_state.last_state if incremental else {},
         )
 
         with st.spinner(ui_text["generating_spinner"]):
-            final_state = graph.invoke(initial_state)
+            usage_tracker = RouteUsageTracker()
+            final_state = graph.invoke(initial_state, config={"callbacks": [usage_tracker]})
+            st.session_state.llm_usage = usage_tracker.summary()
             st.session_state.contents = final_state["contents"]
+            st.session_state.topic = topic
+            # Drop the nested previous state so that states do not pile up across runs
+            st.session_state.last_state = {
+                key: value for key, value in final_state.items() if key != "previous_state"
+            }
+
+        with st.spinner(ui_text["exporting_spinner"]):
+            # Replace the bundle of the previous run with a new one unique to this session
+            if st.session_state.bundle_dir:
+                shutil.rmtree(st.session_state.bundle_dir, ignore_errors=True)
+            st.session_state.post_images = {}
+            st.session_state.bundle_dir = None
+            st.session_state.bundle_zip = None
+            remove_stale_bundles()
+
+            os.makedirs(EXPORT_DIR, exist_ok=True)
+            bundle_dir = tempfile.mkdtemp(dir=EXPORT_DIR)
+            bundle_zip = os.path.join(bundle_dir, "post.zip")
+            try:
+                post_images = export_post(
+                    title=title or topic,
+                    contents=final_state["contents"],
+                    section_images=st.session_state.get("section_images", {}),
+                    output=bundle_zip,
+                    language=language,
+                )
+            except Exception as e:
+                # The post is still shown without images
+                shutil.rmtree(bundle_dir, ignore_errors=True)
+                st.warning(ui_text["export_error"].format(e))
+            else:
+                st.session_state.post_images = post_images
+                st.session_state.bundle_dir = bundle_dir
+                st.session_state.bundle_zip = bundle_zip
 
     # Display generated blog post
     if st.session_state.contents:
         contents = st.session_state.contents
+        bundle_zip = st.session_state.bundle_zip
+        # The bundle may have been removed as stale by another session
+        if bundle_zip and not os.path.exists(bundle_zip):
+            bundle_zip = None
 
-        st.header(initial_state["topic"])
+        st.header(st.session_state.topic)
         st.write("---")
         for idx, content in enumerate(contents):
             st.write(content)
-            if 1 <= idx < len(contents) - 1:
-                if section_images := st.session_state.section_images.get(f"section{idx}", None):
-                    display_images(section_images)
+            if bundle_zip and 1 <= idx < len(contents) - 1:
+                if section_images := st.session_state.post_images.get(f"section{idx}", None):
+                    with zipfile.ZipFile(bundle_zip) as bundle:
+                        display_images([bundle.read(image["display"]) for image in section_images])
             st.write("---")
+
+        if st.session_state.llm_usage:
+            with st.expander(ui_text["usage_expander"]):
+                st.table(
+                    [
+                        {
+                            "route": route,
+                            "models": ", ".join(usage["models"]),
+                            "calls": usage["calls"],
+                            "mean latency (s)": round(usage["mean_latency"], 2),
+                            "input tokens": usage["input_tokens"],
+                            "output tokens": usage["output_tokens"],
+                            "cost (USD)": round(usage["cost"], 6),
+                        }
+                        for route, usage in st.session_state.llm_usage.items()
+                    ]
+                )
+
+        if bundle_zip:
+            with open(bundle_zip, "rb") as f:
+                st.download_button(
+                    ui_text["download_button"],
+                    data=f,
+                    file_name=os.path.basename(bundle_zip),
+                    mime="application/zip",
+                )
@@ -1,15 +1,236 @@
+"""Reference embedder and vector stores for blog writer."""
+
 import ast
+import json
 import os
 import urllib.request
-from typing import Literal
+import uuid
+from typing import Any, Callable, Iterable, Literal
 
-from langchain_chroma import Chroma
+import numpy as np
 from langchain_core.documents import Document
-from langchain_core.tools import tool
+from langchain_core.embeddings import Embeddings
+from langchain_core.vectorstores import VectorStore
 from langchain_openai import OpenAIEmbeddings
 from langchain_text_splitters import RecursiveCharacterTextSplitter
 
 
+class NumpyVectorStore(VectorStore):
+    """In-process vector store backed by a contiguous float32 matrix.
+
+    A single post indexes at most a few hundred chunks, so brute-force search over
+    L2-normalized embeddings is faster than starting a Chroma client and collection.
+    Scores are cosine similarities, i.e. higher is more similar.
+    """
+
+    def __init__(self, embedding: Embeddings):
+        """Create an empty vector store.
+
+        Args:
+            embedding (Embeddings): The embeddings used to embed texts and queries.
+        """
+        self._embedding = embedding
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self.documents: list[Document] = []
+
+    @property
+    def embeddings(self) -> Embeddings:
+        """Access the embeddings used by the vector store."""
+        return self._embedding
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        """L2-normalize vectors along the last axis."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, np.finfo(np.float32).eps)
+
+    def add_texts(
+        self,
+        texts: Iterable[str],
+        metadatas: list[dict] | None = None,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> list[str]:
+        """Embed texts and append them to the matrix.
+
+        Args:
+            texts (Iterable[str]): The texts to add.
+            metadatas (list[dict] | None): The metadata of each text.
+            ids (list[str] | None): The IDs of each text. Random UUIDs are used if not given.
+
+        Returns:
+            list[str]: The IDs of the added texts.
+        """
+        texts = list(texts)
+        if not texts:
+            return []
+        metadatas = metadatas or [{} for _ in texts]
+        ids = list(ids) if ids else [str(uuid.uuid4()) for _ in texts]
+
+        vectors = self._normalize(self._embedding.embed_documents(texts))
+        if self.documents:
+            self._matrix = np.concatenate([self._matrix, vectors])
+        else:
+            self._matrix = np.ascontiguousarray(vectors)
+        self.documents.extend(
+            Document(id=id_, page_content=text, metadata=metadata)
+            for id_, text, metadata in zip(ids, texts, metadatas)
+        )
+        return ids
+
+    def _search(self, embedding: list[float], k: int) -> tuple[np.ndarray, np.ndarray]:
+        """Find the top-k rows of the matrix by cosine similarity.
+
+        Args:
+            embedding (list[float]): The query embedding.
+            k (int): The number of rows to return.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray]: The indices and scores of the rows, best first.
+        """
+        k = min(k, len(self.documents))
+        if k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        scores = self._matrix @ self._normalize(embedding)
+        # argpartition is O(n), so only the k candidates need to be sorted
+        indices = np.argpartition(-scores, k - 1)[:k]
+        indices = indices[np.argsort(-scores[indices])]
+        return indices, scores[indices]
+
+    def similarity_search_with_score_by_vector(
+        self, embedding: list[float], k: int = 4, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        """Return documents most similar to the embedding with their cosine similarity."""
+        indices, scores = self._search(embedding, k)
+        return [(self.documents[i], float(score)) for i, score in zip(indices, scores)]
+
+    def similarity_search_with_score(
+        self, query: str, k: int = 4, **kwargs: Any
+    ) -> list[tuple[Document, float]]:
+        """Return documents most similar to the query with their cosine similarity."""
+        embedding = self._embedding.embed_query(query)
+        return self.similarity_search_with_score_by_vector(embedding, k, **kwargs)
+
+    def similarity_search_by_vector(
+        self, embedding: list[float], k: int = 4, **kwargs: Any
+    ) -> list[Document]:
+        """Return documents most similar to the embedding."""
+        return [doc for doc, _ in self.similarity_search_with_score_by_vector(embedding, k)]
+
+    def similarity_search(self, query: str, k: int = 4, **kwargs: Any) -> list[Document]:
+        """Return documents most similar to the query."""
+        return [doc for doc, _ in self.similarity_search_with_score(query, k)]
+
+    def _select_relevance_score_fn(self) -> Callable[[float], float]:
+        # Scores are already cosine similarities
+        return lambda score: score
+
+    def max_marginal_relevance_search_by_vector(
+        self,
+        embedding: list[float],
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        **kwargs: Any,
+    ) -> list[Document]:
+        """Return documents selected by maximal marginal relevance.
+
+        Similarities between the `fetch_k` candidates are computed once as a matrix, and
+        the maximum similarity to the selected documents is updated incrementally.
+
+        Args:
+            embedding (list[float]): The query embedding.
+            k (int): The number of documents to return.
+            fetch_k (int): The number of candidates to select from.
+            lambda_mult (float): The trade-off between relevance (1) and diversity (0).
+
+        Returns:
+            list[Document]: The selected documents.
+        """
+        indices, scores = self._search(embedding, max(k, fetch_k))
+        if not len(indices):
+            return []
+
+        candidates = self._matrix[indices]
+        redundancy = candidates @ candidates.T
+        selected = [0]
+        max_redundancy = redundancy[0].copy()
+        while len(selected) < min(k, len(indices)):
+            mmr_scores = lambda_mult * scores - (1 - lambda_mult) * max_redundancy
+            mmr_scores[selected] = -np.inf
+            best = int(np.argmax(mmr_scores))
+            selected.append(best)
+            np.maximum(max_redundancy, redundancy[best], out=max_redundancy)
+        return [self.documents[indices[i]] for i in selected]
+
+    def max_marginal_relevance_search(
+        self,
+        query: str,
+        k: int = 4,
+        fetch_k: int = 20,
+        lambda_mult: float = 0.5,
+        **kwargs: Any,
+    ) -> list[Document]:
+        """Return documents selected by maximal marginal relevance."""
+        embedding = self._embedding.embed_query(query)
+        return self.max_marginal_relevance_search_by_vector(embedding, k, fetch_k, lambda_mult)
+
+    def save(self, path: str) -> None:
+        """Save the vector store into a directory.
+
+        The matrix is saved as `embeddings.npy` and the documents as `documents.json`.
+
+        Args:
+            path (str): The directory to save the vector store into.
+        """
+        os.makedirs(path, exist_ok=True)
+        np.save(os.path.join(path, "embeddings.npy"), self._matrix)
+        with open(os.path.join(path, "documents.json"), "w", encoding="utf-8") as f:
+            json.dump(
+                [
+                    {"id": doc.id, "page_content": doc.page_content, "metadata": doc.metadata}
+                    for doc in self.documents
+                ],
+                f,
+                ensure_ascii=False,
+            )
+
+    @classmethod
+    def load(cls, path: str, embedding: Embeddings) -> "NumpyVectorStore":
+        """Load a vector store saved by `save`.
+
+        The matrix is memory-mapped read-only, so it is paged in only as it is searched.
+
+        Args:
+            path (str): The directory the vector store was saved into.
+            embedding (Embeddings): The embeddings used to embed queries.
+
+        Returns:
+            NumpyVectorStore: The loaded vector store.
+        """
+        store = cls(embedding)
+        store._matrix = np.load(os.path.join(path, "embeddings.npy"), mmap_mode="r")
+        with open(os.path.join(path, "documents.json"), encoding="utf-8") as f:
+            store.documents = [Document(**doc) for doc in json.load(f)]
+        return store
+
+    @classmethod
+    def from_texts(
+        cls,
+        texts: list[str],
+        embedding: Embeddings,
+        metadatas: list[dict] | None = None,
+        ids: list[str] | None = None,
+        **kwargs: Any,
+    ) -> "NumpyVectorStore":
+        """Create a vector store from texts."""
+        store = cls(embedding)
+        store.add_texts(texts, metadatas=metadatas, ids=ids)
+        return store
+
+
 class ReferenceEmbedder:
     """This class finds reference descriptions from blog posts using user query.
 
@@ -18,11 +239,10 @@ class ReferenceEmbedder:
     """
 
     def __init__(self):
+        """Create an embedder without a retriever until references are embedded."""
         self.retriever = None
 
-    def set_reference_into_db(
-        self, query: str, platform: Literal["naver"] = "naver"
-    ) -> None:
+    def set_reference_into_db(self, query: str, platform: Literal["naver"] = "naver") -> None:
         """Set reference blog posts into vector database for RAG.
 
         Args:
@@ -44,7 +264,8 @@ class ReferenceEmbedder:
             platform (Literal["naver"]): The platform to search for.
 
         Returns:
-            list[Document]: The contents of the blog posts. If no blog posts are found, returns an empty list.
+            list[Document]: The contents of the blog posts.
+                If no blog posts are found, returns an empty list.
         """
         formatted_results: list[Document] = []
         if platform == "naver":
@@ -68,10 +289,20 @@ class ReferenceEmbedder:
             return formatted_results
         return []
 
-    def embed_blog_posts(self, formatted_blog_posts: list[Document]) -> None:
+    def embed_blog_posts(
+        self,
+        formatted_blog_posts: list[Document],
+        vector_store_cls: type[VectorStore] = NumpyVectorStore,
+    ) -> None:
         """Embed blog posts to vector database.
 
-        TODO (sungchul): make text_splitter, embeddings, and db more flexible as using arguments.
+        Args:
+            formatted_blog_posts (list[Document]): The blog posts to embed.
+            vector_store_cls (type[VectorStore]): The vector store to embed into,
+                e.g. `NumpyVectorStore` or `langchain_chroma.Chroma`.
+                Default is `NumpyVectorStore`.
+
+        TODO (sungchul): make text_splitter and embeddings more flexible as using arguments.
         """
         text_splitter = RecursiveCharacterTextSplitter(
             separators=["\n\n", "\n", ".", ",", " ", ""],
@@ -81,7 +312,7 @@ class ReferenceEmbedder:
 
         texts = text_splitter.split_documents(formatted_blog_posts)
         embeddings = OpenAIEmbeddings()
-        db = Chroma.from_documents(texts, embeddings)
+        db = vector_store_cls.from_documents(texts, embeddings)
         self.retriever = db.as_retriever()
 
 
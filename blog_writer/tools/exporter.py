@@ -0,0 +1,326 @@
+"""Exporter for publish-ready blog posts."""
+
+import hashlib
+import html
+import logging
+import os
+import re
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import TYPE_CHECKING, Callable
+
+import cv2
+import numpy as np
+
+if TYPE_CHECKING:
+    from streamlit.runtime.uploaded_file_manager import UploadedFile
+
+logger = logging.getLogger(__name__)
+
+# Maximum width in pixels of each image variant. "display" matches the body width of Naver blog.
+IMAGE_VARIANTS = {"thumbnail": 320, "display": 860}
+JPEG_QUALITY = 85
+# Below this number of distinct images, resizing one by one is faster than starting a pool
+MIN_IMAGES_FOR_POOL = 4
+
+
+class BundleWriter:
+    """Write files of a post bundle either into a directory or into a zip file.
+
+    Every file is written as soon as it is ready, so the bundle never has to be kept in memory.
+    """
+
+    def __init__(self, output: str):
+        """Open the bundle.
+
+        Args:
+            output (str): The directory or zip file to write the bundle into.
+        """
+        self.output = output
+        self.zip_file = None
+        if output.endswith(".zip"):
+            os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+            self.zip_file = zipfile.ZipFile(output, "w")
+        else:
+            os.makedirs(output, exist_ok=True)
+
+    def write(self, name: str, data: bytes | str) -> None:
+        """Write a file into the bundle.
+
+        Args:
+            name (str): The path of the file relative to the bundle root.
+            data (bytes | str): The contents of the file.
+        """
+        if isinstance(data, str):
+            data = data.encode("utf-8")
+
+        if self.zip_file is not None:
+            # JPEG is already compressed, so only deflate text files
+            compress_type = zipfile.ZIP_STORED if name.endswith(".jpg") else zipfile.ZIP_DEFLATED
+            self.zip_file.writestr(name, data, compress_type=compress_type)
+            return
+
+        path = os.path.join(self.output, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(data)
+
+    def close(self) -> None:
+        """Close the bundle."""
+        if self.zip_file is not None:
+            self.zip_file.close()
+
+    def __enter__(self) -> "BundleWriter":
+        """Return the bundle."""
+        return self
+
+    def __exit__(self, *args) -> None:
+        """Close the bundle."""
+        self.close()
+
+
+def get_image_hash(image_bytes: bytes) -> str:
+    """Get the content hash of an image used in its file name.
+
+    Args:
+        image_bytes (bytes): The original image file.
+
+    Returns:
+        str: The first 16 characters of the SHA-256 hex digest.
+    """
+    return hashlib.sha256(image_bytes).hexdigest()[:16]
+
+
+def get_image_name(image_hash: str, variant: str) -> str:
+    """Get the path of an image variant relative to the bundle root.
+
+    Args:
+        image_hash (str): The content hash of the original image.
+        variant (str): The name of the variant, e.g. "display".
+
+    Returns:
+        str: The path of the image variant.
+    """
+    return f"images/{image_hash}_{variant}.jpg"
+
+
+def resize_image(
+    image_bytes: bytes,
+    variants: dict[str, int] = IMAGE_VARIANTS,
+    quality: int = JPEG_QUALITY,
+) -> dict[str, bytes]:
+    """Resize an image into web variants and compress them to JPEG.
+
+    Images narrower than a variant's width are only re-encoded, never upscaled.
+
+    Args:
+        image_bytes (bytes): The original image file.
+        variants (dict[str, int]): The maximum width of each variant.
+        quality (int): The JPEG quality of the variants.
+
+    Returns:
+        dict[str, bytes]: The encoded JPEG of each variant.
+    """
+    image = cv2.imdecode(np.frombuffer(image_bytes, np.uint8), cv2.IMREAD_COLOR)
+    if image is None:
+        raise ValueError("Failed to decode image")
+
+    height, width = image.shape[:2]
+    encoded_variants = {}
+    for variant, max_width in variants.items():
+        resized = image
+        if width > max_width:
+            resized = cv2.resize(
+                image,
+                (max_width, round(height * max_width / width)),
+                interpolation=cv2.INTER_AREA,
+            )
+        _, encoded = cv2.imencode(
+            ".jpg",
+            resized,
+            [cv2.IMWRITE_JPEG_QUALITY, quality, cv2.IMWRITE_JPEG_OPTIMIZE, 1],
+        )
+        encoded_variants[variant] = encoded.tobytes()
+    return encoded_variants
+
+
+def export_images(
+    section_images: dict[str, list["UploadedFile"]],
+    writer: BundleWriter,
+    max_workers: int | None = None,
+) -> dict[str, list[dict[str, str]]]:
+    """Resize images and stream the variants into the bundle.
+
+    Identical images are processed only once. With at least `MIN_IMAGES_FOR_POOL` distinct
+    images, they are resized in a pool of at most `min(max_workers, number of images)` threads,
+    as OpenCV releases the GIL while decoding, resizing and encoding. At most `2 * max_workers`
+    images are in flight at once, and each result is written and released as soon as it is done.
+    Images that fail to be resized are skipped with a warning.
+
+    Args:
+        section_images (dict[str, list[UploadedFile]]): The images of each section.
+        writer (BundleWriter): The bundle to write the variants into.
+        max_workers (int | None): The maximum number of worker threads.
+            Default is the CPU count.
+
+    Returns:
+        dict[str, list[dict[str, str]]]: The path of each variant of each image per section.
+    """
+    image_hashes: dict[str, list[str]] = {}
+    unique_images: dict[str, "UploadedFile"] = {}
+    for section_key, images in section_images.items():
+        image_hashes[section_key] = []
+        for image in images or []:
+            image_hash = get_image_hash(image.getvalue())
+            image_hashes[section_key].append(image_hash)
+            unique_images.setdefault(image_hash, image)
+
+    failed_hashes = set()
+
+    def write_variants(image_hash: str, get_variants: Callable[[], dict[str, bytes]]) -> None:
+        try:
+            variants = get_variants()
+        except Exception as e:
+            logger.warning(f"Failed to resize image {image_hash}, skipping it: {e}")
+            failed_hashes.add(image_hash)
+            return
+        for variant, data in variants.items():
+            writer.write(get_image_name(image_hash, variant), data)
+
+    max_workers = min(max_workers or os.cpu_count() or 1, len(unique_images))
+    if max_workers <= 1 or len(unique_images) < MIN_IMAGES_FOR_POOL:
+        for image_hash, image in unique_images.items():
+            write_variants(image_hash, lambda: resize_image(image.getvalue()))
+    else:
+        pending: dict[Future, str] = {}
+
+        def write_done(futures: set[Future]) -> None:
+            for future in futures:
+                write_variants(pending.pop(future), future.result)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for image_hash, image in unique_images.items():
+                if len(pending) >= 2 * max_workers:
+                    write_done(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[executor.submit(resize_image, image.getvalue())] = image_hash
+            write_done(wait(pending).done)
+
+    return {
+        section_key: [
+            {variant: get_image_name(image_hash, variant) for variant in IMAGE_VARIANTS}
+            for image_hash in hashes
+            if image_hash not in failed_hashes
+        ]
+        for section_key, hashes in image_hashes.items()
+    }
+
+
+def markdown_to_naver_html(markdown: str) -> str:
+    """Convert a markdown section into HTML following Naver blog conventions.
+
+    Naver's editor centers text, uses short paragraphs separated by line breaks and
+    renders headings as subtitles, so only headings, lists, bold text and paragraphs are kept.
+
+    Args:
+        markdown (str): The markdown content of a section.
+
+    Returns:
+        str: The HTML content of the section.
+    """
+
+    def format_inline(text: str) -> str:
+        text = html.escape(text.strip())
+        return re.sub(r"\*\*(.+?)\*\*", r"<strong>\1</strong>", text)
+
+    blocks = []
+    paragraph = []
+    items = []
+
+    def flush() -> None:
+        if paragraph:
+            blocks.append(f'<p style="text-align:center">{"<br>".join(paragraph)}</p>')
+            paragraph.clear()
+        if items:
+            blocks.append("<ul>" + "".join(f"<li>{item}</li>" for item in items) + "</ul>")
+            items.clear()
+
+    for block in re.split(r"\n\s*\n", markdown.strip()):
+        for line in block.splitlines():
+            stripped = line.strip()
+            if not stripped:
+                continue
+            if heading := re.match(r"^(#{1,6})\s+(.*)$", stripped):
+                flush()
+                # The post title is <h2>, so section headings start from <h3>
+                level = min(len(heading.group(1)) + 1, 6)
+                text = format_inline(heading.group(2))
+                blocks.append(f'<h{level} style="text-align:center">{text}</h{level}>')
+            elif item := re.match(r"^[-*]\s+(.*)$", stripped):
+                if paragraph:
+                    flush()
+                items.append(format_inline(item.group(1)))
+            else:
+                if items:
+                    flush()
+                paragraph.append(format_inline(stripped))
+        flush()
+
+    return "\n".join(blocks)
+
+
+def export_post(
+    title: str,
+    contents: list[str],
+    section_images: dict[str, list["UploadedFile"]],
+    output: str,
+    language: str = "ko",
+    max_workers: int | None = None,
+) -> dict[str, list[dict[str, str]]]:
+    """Export a blog post as a self-contained bundle.
+
+    The bundle contains `post.md`, `post.html` and the resized images under `images/`,
+    named by their content hash. If `output` ends with ".zip", the bundle is written as
+    a zip file, otherwise into the `output` directory.
+
+    Args:
+        title (str): The title of the blog post.
+        contents (list[str]): The contents of the blog post, i.e. greeting, sections and
+            conclusion in order.
+        section_images (dict[str, list[UploadedFile]]): The images of each section.
+        output (str): The directory or zip file to write the bundle into.
+        language (str): The language of the blog post.
+        max_workers (int | None): The number of worker threads to resize images.
+
+    Returns:
+        dict[str, list[dict[str, str]]]: The path of each variant of each image per section,
+            relative to the bundle root.
+    """
+    with BundleWriter(output) as writer:
+        post_images = export_images(section_images, writer, max_workers)
+
+        markdown_blocks = [f"# {title}"]
+        html_blocks = [f'<h2 style="text-align:center">{html.escape(title)}</h2>']
+        for idx, content in enumerate(contents):
+            markdown_blocks.append(content)
+            html_blocks.append(markdown_to_naver_html(content))
+            images = post_images.get(f"section{idx}", []) if 1 <= idx < len(contents) - 1 else []
+            for image in images:
+                markdown_blocks.append(f"![]({image['display']})")
+                html_blocks.append(
+                    f'<p style="text-align:center"><img src="{image["display"]}" '
+                    f'style="max-width:100%"></p>'
+                )
+            if idx < len(contents) - 1:
+                markdown_blocks.append("---")
+                html_blocks.append("<hr>")
+
+        writer.write("post.md", "\n\n".join(markdown_blocks) + "\n")
+        writer.write(
+            "post.html",
+            f'<!DOCTYPE html>\n<html lang="{language}">\n<head>\n<meta charset="utf-8">\n'
+            f"<title>{html.escape(title)}</title>\n</head>\n<body>\n"
+            + "\n".join(html_blocks)
+            + "\n</body>\n</html>\n",
+        )
+
+    return post_images
@@ -1,6 +1,28 @@
 """Utils for blog writer."""
 
+from .llm import (
+    DEFAULT_MODEL_CONFIG,
+    MODEL_PRICES,
+    MODEL_ROUTES,
+    ModelConfig,
+    RouteUsageTracker,
+    get_content,
+    get_llm,
+    get_model_config,
+)
 from .state import State
-from .utils import save_graph
+from .utils import get_fingerprint, save_graph
 
-__all__ = ["State", "save_graph"]
+__all__ = [
+    "DEFAULT_MODEL_CONFIG",
+    "MODEL_PRICES",
+    "MODEL_ROUTES",
+    "ModelConfig",
+    "RouteUsageTracker",
+    "State",
+    "get_content",
+    "get_fingerprint",
+    "get_llm",
+    "get_model_config",
+    "save_graph",
+]
@@ -0,0 +1,256 @@
+"""LLM routing for blog writer."""
+
+import logging
+import re
+import time
+from typing import Any, TypedDict
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import LLMResult
+from langchain_core.runnables import Runnable
+from langchain_openai import ChatOpenAI
+
+logger = logging.getLogger(__name__)
+
+
+class ModelConfig(TypedDict, total=False):
+    """Model settings for a single LLM call."""
+
+    model: str
+    max_tokens: int | None
+    temperature: float
+    timeout: float | None
+    max_retries: int
+    fallbacks: list[str]
+
+
+DEFAULT_MODEL_CONFIG: ModelConfig = {
+    "model": "gpt-4o-mini",
+    "max_tokens": None,
+    "temperature": 0.7,
+    "timeout": None,
+    "max_retries": 2,
+    "fallbacks": [],
+}
+
+# Routes are keyed by "<node>.<call type>", i.e. "outline_generator.outline", "writer.greeting",
+# "writer.caption", "writer.section" and "writer.conclusion". Routes not listed here use
+# `DEFAULT_MODEL_CONFIG`. Cheap, latency-critical calls use the fastest model with hard output
+# caps and short timeouts. After its retries, a slow or rate-limited call falls back to
+# gpt-4o-mini, the default model, so a fallback never costs more than a default call.
+MODEL_ROUTES: dict[str, ModelConfig] = {
+    "writer.greeting": {
+        "model": "gpt-4.1-nano",
+        "max_tokens": 300,
+        "timeout": 20,
+        "max_retries": 1,
+        "fallbacks": ["gpt-4o-mini"],
+    },
+    "writer.caption": {
+        "model": "gpt-4.1-nano",
+        "max_tokens": 60,
+        "temperature": 0.0,
+        "timeout": 15,
+        "max_retries": 1,
+        "fallbacks": ["gpt-4o-mini"],
+    },
+}
+
+# USD per 1M input and output tokens, used to estimate the cost of each route
+MODEL_PRICES: dict[str, tuple[float, float]] = {
+    "gpt-4.1-nano": (0.10, 0.40),
+    "gpt-4o-mini": (0.15, 0.60),
+    "gpt-4o": (2.50, 10.00),
+}
+
+
+def get_model_config(
+    node: str,
+    call_type: str,
+    routes: dict[str, ModelConfig] | None = None,
+) -> ModelConfig:
+    """Resolve the model settings for a call.
+
+    Settings are merged in order of `DEFAULT_MODEL_CONFIG`, `MODEL_ROUTES` and `routes`,
+    so that `routes` only needs to contain the values to override.
+
+    Args:
+        node (str): The name of the graph node, e.g. "writer".
+        call_type (str): The type of the call within the node, e.g. "caption".
+        routes (dict[str, ModelConfig] | None): Per-run overrides keyed by "<node>.<call type>".
+
+    Returns:
+        ModelConfig: The resolved model settings.
+    """
+    route = f"{node}.{call_type}"
+    return {
+        **DEFAULT_MODEL_CONFIG,
+        **MODEL_ROUTES.get(route, {}),
+        **(routes or {}).get(route, {}),
+    }
+
+
+def get_llm(
+    node: str,
+    call_type: str,
+    routes: dict[str, ModelConfig] | None = None,
+) -> Runnable:
+    """Create the LLM for a call based on the routing configuration.
+
+    The returned runnable is named "<node>.<call type>" so that latency and token usage of
+    each route can be compared in the tracing backend (e.g. LangSmith).
+
+    Args:
+        node (str): The name of the graph node, e.g. "writer".
+        call_type (str): The type of the call within the node, e.g. "caption".
+        routes (dict[str, ModelConfig] | None): Per-run overrides keyed by "<node>.<call type>".
+
+    Returns:
+        Runnable: The chat model, wrapped with its fallback chain if any.
+    """
+    config = get_model_config(node, call_type, routes)
+
+    def create_chat_model(model: str) -> ChatOpenAI:
+        return ChatOpenAI(
+            model=model,
+            max_tokens=config["max_tokens"],
+            temperature=config["temperature"],
+            timeout=config["timeout"],
+            max_retries=config["max_retries"],
+        )
+
+    llm = create_chat_model(config["model"])
+    if config["fallbacks"]:
+        llm = llm.with_fallbacks([create_chat_model(model) for model in config["fallbacks"]])
+    return llm.with_config(
+        run_name=f"{node}.{call_type}",
+        metadata={"route": f"{node}.{call_type}", "primary_model": config["model"]},
+    )
+
+
+def get_content(message: AIMessage) -> str:
+    """Get the content of a response, trimming it if it was cut off by `max_tokens`.
+
+    Args:
+        message (AIMessage): The response of the chat model.
+
+    Returns:
+        str: The content, ending at the last complete sentence if the response was truncated.
+    """
+    content = message.content
+    if message.response_metadata.get("finish_reason") != "length":
+        return content
+
+    sentence_ends = list(re.finditer(r"[.!?。](?=\s|$)", content))
+    logger.warning("Response was truncated by max_tokens, trimming to the last sentence")
+    if not sentence_ends:
+        return content
+    return content[: sentence_ends[-1].end()]
+
+
+def get_model_price(model: str) -> tuple[float, float] | None:
+    """Get the price of a model, matching dated model names such as "gpt-4o-mini-2024-07-18".
+
+    Args:
+        model (str): The name of the model.
+
+    Returns:
+        tuple[float, float] | None: USD per 1M input and output tokens, or None if unknown.
+    """
+    for name in sorted(MODEL_PRICES, key=len, reverse=True):
+        if model.startswith(name):
+            return MODEL_PRICES[name]
+    return None
+
+
+class RouteUsageTracker(BaseCallbackHandler):
+    """Record latency, token usage and estimated cost of each LLM call per route.
+
+    Pass it as a callback when invoking the graph, e.g.
+    `graph.invoke(state, config={"callbacks": [tracker]})`. Calls are matched to their route
+    through the metadata set by `get_llm`, so a call answered by a fallback model is recorded
+    under its route with the model that actually answered.
+    """
+
+    def __init__(self):
+        """Create an empty tracker."""
+        self.records: list[dict] = []
+        self._starts: dict[UUID, tuple[float, str]] = {}
+
+    def on_chat_model_start(
+        self,
+        serialized: dict[str, Any],
+        messages: list[list[Any]],
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        """Record the start time and route of a call."""
+        self._starts[run_id] = (time.perf_counter(), (metadata or {}).get("route", "unknown"))
+
+    def on_llm_end(self, response: LLMResult, *, run_id: UUID, **kwargs: Any) -> None:
+        """Record the latency and token usage of a finished call."""
+        if run_id not in self._starts:
+            return
+        start, route = self._starts.pop(run_id)
+
+        usage = {}
+        generation = response.generations[0][0] if response.generations else None
+        if generation is not None and isinstance(getattr(generation, "message", None), AIMessage):
+            usage = generation.message.usage_metadata or {}
+        model = (response.llm_output or {}).get("model_name", "")
+        input_tokens = usage.get("input_tokens", 0)
+        output_tokens = usage.get("output_tokens", 0)
+        price = get_model_price(model)
+
+        record = {
+            "route": route,
+            "model": model,
+            "latency": time.perf_counter() - start,
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "cost": ((input_tokens * price[0] + output_tokens * price[1]) / 1e6 if price else None),
+        }
+        self.records.append(record)
+        logger.info(
+            f"{route} ({model}): {record['latency']:.2f}s, "
+            f"{input_tokens} input / {output_tokens} output tokens"
+        )
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        """Forget a failed call, e.g. one that is retried by a fallback model."""
+        self._starts.pop(run_id, None)
+
+    def summary(self) -> dict[str, dict]:
+        """Summarize the recorded calls per route.
+
+        Returns:
+            dict[str, dict]: The number of calls, total and mean latency in seconds, token counts
+                and estimated cost in USD of each route.
+        """
+        summary: dict[str, dict] = {}
+        for record in self.records:
+            route = summary.setdefault(
+                record["route"],
+                {
+                    "calls": 0,
+                    "models": [],
+                    "latency": 0.0,
+                    "input_tokens": 0,
+                    "output_tokens": 0,
+                    "cost": 0.0,
+                },
+            )
+            route["calls"] += 1
+            if record["model"] not in route["models"]:
+                route["models"].append(record["model"])
+            route["latency"] += record["latency"]
+            route["input_tokens"] += record["input_tokens"]
+            route["output_tokens"] += record["output_tokens"]
+            route["cost"] += record["cost"] or 0.0
+        for route in summary.values():
+            route["mean_latency"] = route["latency"] / route["calls"]
+        return summary
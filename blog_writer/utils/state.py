@@ -21,3 +21,7 @@ class State(TypedDict):
     naver_client_id: str
     naver_client_secret: str
     custom_sections: bool = False
+    model_routes: dict = {}
+    previous_state: dict = {}
+    fingerprints: dict = {}
+    image_captions: dict = {}
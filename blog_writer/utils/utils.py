@@ -1,6 +1,8 @@
 """Utils for blog writer."""
 
-from typing import TYPE_CHECKING
+import hashlib
+import json
+from typing import TYPE_CHECKING, Any
 
 import cv2
 import numpy as np
@@ -26,3 +28,22 @@ def save_graph(graph: "Graph", filename: str = "images/blog_workflow.png") -> No
         cv2.imwrite(filename, img)
     except Exception as e:
         print(f"Failed to save graph visualization: {e}")
+
+
+def get_fingerprint(*parts: Any) -> str:
+    """Get a fingerprint of the given values to detect changes between runs.
+
+    Bytes are hashed as is, and other values are hashed as their JSON representation.
+
+    Args:
+        *parts (Any): The values to fingerprint.
+
+    Returns:
+        str: The SHA-256 hex digest of the values.
+    """
+    digest = hashlib.sha256()
+    for part in parts:
+        if not isinstance(part, bytes):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False, default=str).encode("utf-8")
+        digest.update(hashlib.sha256(part).digest())
+    return digest.hexdigest()